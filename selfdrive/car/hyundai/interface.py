@@ -395,7 +395,7 @@ class CarInterface(CarInterfaceBase):
 
     if self.CC.longcontrol and self.CS.cruise_unavail:
       events.add(EventName.brakeUnavailable)
-    if abs(ret.steeringAngleDeg) > 90. and EventName.steerTempUnavailable not in events.events:
+    if abs(ret.steeringAngleDeg) > 90. and EventName.steerTempUnavailable not in events:
       events.add(EventName.steerTempUnavailable)
     if self.low_speed_alert and not self.CS.mdps_bus:
       events.add(EventName.belowSteerSpeed)
@@ -403,8 +403,8 @@ class CarInterface(CarInterfaceBase):
       events.add(EventName.turningIndicatorOn)
     #if self.CS.lkas_button_on != self.CS.prev_lkas_button:
     #  events.add(EventName.buttonCancel)
-    if self.mad_mode_enabled and EventName.pedalPressed in events.events:
-      events.events.remove(EventName.pedalPressed)
+    if self.mad_mode_enabled and EventName.pedalPressed in events:
+      events.remove(EventName.pedalPressed)
 
   # handle button presses
     for b in ret.buttonEvents:
@@ -415,10 +415,10 @@ class CarInterface(CarInterfaceBase):
         # do enable on both accel and decel buttons
         if b.type in [ButtonType.accelCruise, ButtonType.decelCruise] and not b.pressed:
           events.add(EventName.buttonEnable)
-        if EventName.wrongCarMode in events.events:
-          events.events.remove(EventName.wrongCarMode)
-        if EventName.pcmDisable in events.events:
-          events.events.remove(EventName.pcmDisable)
+        if EventName.wrongCarMode in events:
+          events.remove(EventName.wrongCarMode)
+        if EventName.pcmDisable in events:
+          events.remove(EventName.pcmDisable)
       elif not self.CC.longcontrol and ret.cruiseState.enabled:
         # do enable on decel button only
         if b.type == ButtonType.decelCruise and not b.pressed:
@@ -150,7 +150,7 @@ class Controls:
     self.saturated_count = 0
     self.distance_traveled = 0
     self.last_functional_fan_frame = 0
-    self.events_prev = []
+    self.events_prev = ()
     self.current_alert_types = [ET.PERMANENT]
     self.logged_comm_issue = False
     self.v_target = 0.0
@@ -268,7 +268,7 @@ class Controls:
     else:
       self.logged_comm_issue = False
 
-    if not self.sm['lateralPlan'].mpcSolutionValid and not (EventName.turningIndicatorOn in self.events.names):
+    if not self.sm['lateralPlan'].mpcSolutionValid and not (EventName.turningIndicatorOn in self.events):
       self.events.add(EventName.plannerError)
     if not self.sm['liveLocationKalman'].sensorsOK and not NOSENSOR:
       if self.sm.frame > 5 / DT_CTRL:  # Give locationd some time to receive all the inputs
@@ -658,7 +658,7 @@ class Controls:
       ce_send = messaging.new_message('carEvents', len(self.events))
       ce_send.carEvents = car_events
       self.pm.send('carEvents', ce_send)
-    self.events_prev = self.events.names.copy()
+    self.events_prev = self.events.names
 
     # carParams - logged every 50 seconds (> 1 per segment)
     if (self.sm.frame % int(50. / DT_CTRL) == 0):
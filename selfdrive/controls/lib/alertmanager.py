@@ -48,7 +48,7 @@ class AlertManager:
       added_alert.start_time = frame * DT_CTRL
 
       # if new alert is higher priority, log it
-      if not len(self.activealerts) or added_alert.alert_priority > self.activealerts[0].alert_priority:
+      if not len(self.activealerts) or added_alert > self.activealerts[0]:
         cloudlog.event('alert_add', alert_type=added_alert.alert_type, enabled=enabled)
 
       self.activealerts.append(added_alert)
@@ -1,5 +1,7 @@
+import sys
 from enum import IntEnum
-from typing import Dict, Union, Callable, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union, Callable, Any
 
 from cereal import log, car
 import cereal.messaging as messaging
@@ -36,67 +38,115 @@ class ET:
   PERMANENT = 'permanent'
 
 
+# index of each event type, and a bit for each so sets of event types can be tested with a single AND
+_ET_IDX = {et: i for i, et in enumerate([ET.ENABLE, ET.PRE_ENABLE, ET.NO_ENTRY, ET.WARNING, ET.USER_DISABLE,
+                                         ET.SOFT_DISABLE, ET.IMMEDIATE_DISABLE, ET.PERMANENT])}
+ET_BIT = {et: 1 << i for et, i in _ET_IDX.items()}
+N_ET = len(_ET_IDX)
+
+
 # get event name from enum
-EVENT_NAME = {v: k for k, v in EventName.schema.enumerants.items()}
+N_EVENTS = max(EventName.schema.enumerants.values()) + 1
+EVENT_NAME = [""] * N_EVENTS
+for _name, _value in EventName.schema.enumerants.items():
+  EVENT_NAME[_value] = sys.intern(_name)
 
 
 class Events:
   def __init__(self):
-    self.events = []
+    # active events, as a dict used as an insertion-ordered set so each event is only handled once
+    self._active: Dict[int, None] = {}
     self.static_events = []
-    self.events_prev = dict.fromkeys(EVENTS.keys(), 0)
+    self._static_mask = 0
+    self._active_mask = 0
+    # number of consecutive frames each event has been active, indexed by event name.
+    # plain ints since create_alerts reads them per alert; only events in _counted are nonzero
+    self.events_prev = [0] * N_EVENTS
+    self._counted: Dict[int, None] = {}
+
+  @property
+  def events(self):
+    # a tuple, so stale code mutating the returned sequence fails instead of silently doing nothing
+    return tuple(self._active)
 
   @property
   def names(self):
     return self.events
 
   def __len__(self):
-    return len(self.events)
+    return len(self._active)
+
+  def __contains__(self, event_name):
+    return event_name in self._active
 
   def add(self, event_name, static=False):
     if static:
       self.static_events.append(event_name)
-    self.events.append(event_name)
+      self._static_mask |= _EVENTS_TYPE_MASK[event_name]
+    self._active[event_name] = None
+    self._active_mask |= _EVENTS_TYPE_MASK[event_name]
+
+  def remove(self, event_name):
+    del self._active[event_name]
+    self._active_mask = 0
+    for e in self._active:
+      self._active_mask |= _EVENTS_TYPE_MASK[e]
 
   def clear(self):
-    self.events_prev = {k: (v + 1 if k in self.events else 0) for k, v in self.events_prev.items()}
-    self.events = self.static_events.copy()
+    events_prev = self.events_prev
+    for e in self._counted:
+      if e not in self._active:
+        events_prev[e] = 0
+    for e in self._active:
+      events_prev[e] += 1
+    self._counted = self._active
+    self._active = dict.fromkeys(self.static_events)
+    self._active_mask = self._static_mask
 
   def any(self, event_type):
-    for e in self.events:
-      if event_type in EVENTS.get(e, {}).keys():
-        return True
-    return False
+    return bool(self._active_mask & ET_BIT[event_type])
 
   def create_alerts(self, event_types, callback_args=None):
     if callback_args is None:
       callback_args = []
 
+    req = [(et, _ET_IDX[et]) for et in event_types]
+    req_mask = 0
+    for et in event_types:
+      req_mask |= ET_BIT[et]
+
+    # locals, since these are read for every active event and matched alert
+    events_prev, dt_ctrl = self.events_prev, DT_CTRL
+    table, is_callable, alert_type_str = _EVENTS_TABLE, _IS_CALLABLE, _ALERT_TYPE_STR
     ret = []
-    for e in self.events:
-      types = EVENTS[e].keys()
-      for et in event_types:
-        if et in types:
-          alert = EVENTS[e][et]
-          if not isinstance(alert, Alert):
-            alert = alert(*callback_args)
-
-          if DT_CTRL * (self.events_prev[e] + 1) >= alert.creation_delay:
-            alert.alert_type = f"{EVENT_NAME[e]}/{et}"
-            alert.event_type = et
-            ret.append(alert)
+    for e in self._active:
+      if not (_EVENTS_TYPE_MASK[e] & req_mask):
+        continue
+
+      base = e * N_ET
+      for et, idx in req:
+        alert = table[base + idx]
+        if alert is None:
+          continue
+        if is_callable[base + idx]:
+          alert = alert(*callback_args)
+
+        if dt_ctrl * (events_prev[e] + 1) >= alert.creation_delay:
+          alert.alert_type = alert_type_str[base + idx]
+          alert.event_type = et
+          ret.append(alert)
     return ret
 
   def add_from_msg(self, events):
     for e in events:
-      self.events.append(e.name.raw)
+      self.add(e.name.raw)
 
   def to_msg(self):
     ret = []
-    for event_name in self.events:
+    for event_name in self._active:
       event = car.CarEvent.new_message()
       event.name = event_name
-      for event_type in EVENTS.get(event_name, {}).keys():
+      for event_type in _EVENT_TYPES[event_name]:
         setattr(event, event_type, True)
       ret.append(event)
     return ret
@@ -104,6 +154,10 @@ class Events:
 # 메세지 한글화 : 로웰 ( https://github.com/crwusiz/openpilot )
 
 class Alert:
+  __slots__ = ('alert_text_1', 'alert_text_2', 'alert_status', 'alert_size', 'alert_priority', 'visual_alert',
+               'audible_alert', 'duration_sound', 'duration_hud_alert', 'duration_text', 'alert_rate',
+               'creation_delay', 'start_time', 'alert_type', 'event_type', '_pri')
+
   def __init__(self,
                alert_text_1: str,
                alert_text_2: str,
@@ -123,6 +177,7 @@ class Alert:
     self.alert_status = alert_status
     self.alert_size = alert_size
     self.alert_priority = alert_priority
+    self._pri = int(alert_priority)
     self.visual_alert = visual_alert
     self.audible_alert = audible_alert
 
@@ -141,10 +196,12 @@ class Alert:
     return f"{self.alert_text_1}/{self.alert_text_2} {self.alert_priority} {self.visual_alert} {self.audible_alert}"
 
   def __gt__(self, alert2) -> bool:
-    return self.alert_priority > alert2.alert_priority
+    return self._pri > alert2._pri
 
 
 class NoEntryAlert(Alert):
+  __slots__ = ()
+
   def __init__(self, alert_text_2, audible_alert=AudibleAlert.chimeError, duration_sound=.4,
                visual_alert=VisualAlert.none, duration_hud_alert=2.):
     super().__init__("openpilot Unavailable", alert_text_2, AlertStatus.normal,
@@ -154,42 +211,61 @@ class NoEntryAlert(Alert):
 
 
 class SoftDisableAlert(Alert):
+  __slots__ = ()
+
   def __init__(self, alert_text_2):
     super().__init__("TAKE CONTROL IMMEDIATELY", alert_text_2,
     #super().__init__("핸들을 즉시 잡아주세요", alert_text_2,
                      AlertStatus.critical, AlertSize.full,
                      Priority.MID, VisualAlert.steerRequired,
-                     AudibleAlert.chimeWarningRepeat, .1, 2., 2.),
+                     AudibleAlert.chimeWarningRepeat, .1, 2., 2.)
 
 
 class ImmediateDisableAlert(Alert):
+  __slots__ = ()
+
   def __init__(self, alert_text_2, alert_text_1="TAKE CONTROL IMMEDIATELY"):
   #def __init__(self, alert_text_2, alert_text_1="핸들을 즉시 잡아주세요"):
     super().__init__(alert_text_1, alert_text_2,
                      AlertStatus.critical, AlertSize.full,
                      Priority.HIGHEST, VisualAlert.steerRequired,
-                     AudibleAlert.chimeWarningRepeat, 2.2, 3., 4.),
+                     AudibleAlert.chimeWarningRepeat, 2.2, 3., 4.)
 
 
 class EngagementAlert(Alert):
+  __slots__ = ()
+
   def __init__(self, audible_alert=True):
     super().__init__("", "",
                      AlertStatus.normal, AlertSize.none,
                      Priority.MID, VisualAlert.none,
-                     audible_alert, .2, 0., 0.),
+                     audible_alert, .2, 0., 0.)
 
 
 class NormalPermanentAlert(Alert):
+  __slots__ = ()
+
   def __init__(self, alert_text_1: str, alert_text_2: str, duration_text: float = 0.2):
     super().__init__(alert_text_1, alert_text_2,
                      AlertStatus.normal, AlertSize.mid if len(alert_text_2) else AlertSize.small,
-                     Priority.LOWER, VisualAlert.none, AudibleAlert.none, 0., 0., duration_text),
+                     Priority.LOWER, VisualAlert.none, AudibleAlert.none, 0., 0., duration_text)
 
 
 # ********** alert callback functions **********
+# speed unit name and conversion from m/s, indexed by is_metric
+_SPEED_UNITS = (("mph", CV.MS_TO_MPH), ("㎞/h", CV.MS_TO_KPH))
+_CALIBRATION_SPEED_TEXT = tuple("Drive Above %d %s" % (int(MIN_SPEED_FILTER * k), unit) for unit, k in _SPEED_UNITS)
+
+
+@lru_cache(maxsize=None)
+def _no_entry_alert(alert_text_2: str, duration_hud_alert: float) -> Alert:
+  # callbacks with a fixed set of texts share one instance per text, like the alerts in EVENTS
+  return NoEntryAlert(alert_text_2, duration_hud_alert=duration_hud_alert)
+
+
 def below_steer_speed_alert(CP: car.CarParams, sm: messaging.SubMaster, metric: bool) -> Alert:
-  speed = int(round(CP.minSteerSpeed * (CV.MS_TO_KPH if metric else CV.MS_TO_MPH)))
-  unit = "㎞/h" if metric else "mph"
+  unit, ms_to_unit = _SPEED_UNITS[metric]
+  speed = int(round(CP.minSteerSpeed * ms_to_unit))
   return Alert(
     "TAKE CONTROL",
     "Steer Unavailable Below %d %s" % (speed+0, unit),
@@ -200,11 +276,9 @@ def below_steer_speed_alert(CP: car.CarParams, sm: messaging.SubMaster, metric:
 
 
 def calibration_incomplete_alert(CP: car.CarParams, sm: messaging.SubMaster, metric: bool) -> Alert:
-  speed = int(MIN_SPEED_FILTER * (CV.MS_TO_KPH if metric else CV.MS_TO_MPH))
-  unit = "㎞/h" if metric else "mph"
   return Alert(
     "Calibration in Progress: %d%%" % sm['liveCalibration'].calPerc,
-    "Drive Above %d %s" % (speed, unit),
+    _CALIBRATION_SPEED_TEXT[metric],
     #"캘리브레이션 진행중입니다 : %d%%" % sm['liveCalibration'].calPerc,
     #"속도를 %d %s 이상으로 주행하세요" % (speed, unit),
     AlertStatus.normal, AlertSize.mid,
@@ -228,7 +302,7 @@ def wrong_car_mode_alert(CP: car.CarParams, sm: messaging.SubMaster, metric: boo
   if CP.carName == "honda":
     text = "Main Switch Off"
     #text = "메인 스위치 OFF"
-  return NoEntryAlert(text, duration_hud_alert=0.)
+  return _no_entry_alert(text, 0.)
 
 
 def startup_fuzzy_fingerprint_alert(CP: car.CarParams, sm: messaging.SubMaster, metric: bool) -> Alert:
@@ -243,7 +317,9 @@ def startup_fuzzy_fingerprint_alert(CP: car.CarParams, sm: messaging.SubMaster,
 
 def joystick_alert(CP: car.CarParams, sm: messaging.SubMaster, metric: bool) -> Alert:
   axes = sm['testJoystick'].axes
-  gb, steer = list(axes)[:2] if len(axes) else (0., 0.)
+  n = len(axes)
+  gb = axes[0] if n > 0 else 0.
+  steer = axes[1] if n > 1 else 0.
   return Alert(
     "Joystick Mode",
     #"조이스틱 모드",
@@ -1092,3 +1168,24 @@ EVENTS: Dict[int, Dict[str, Union[Alert, Callable[[Any, messaging.SubMaster, boo
   },
 
 }
+
+
+# flattened copy of EVENTS indexed by event name * N_ET + event type index, with whether each entry is an
+# alert callback, their alert_type strings ("<event name>/<event type>") and the event types of each event
+# as an ET_BIT mask
+_EVENTS_TABLE: List[Optional[Union[Alert, Callable[[Any, messaging.SubMaster, bool], Alert]]]] = [None] * (N_EVENTS * N_ET)
+_IS_CALLABLE = bytearray(N_EVENTS * N_ET)
+_ALERT_TYPE_STR: List[str] = [""] * (N_EVENTS * N_ET)
+_EVENTS_TYPE_MASK: List[int] = [0] * N_EVENTS
+for _e, _alerts in EVENTS.items():
+  for _et, _alert in _alerts.items():
+    _idx = _e * N_ET + _ET_IDX[_et]
+    _EVENTS_TABLE[_idx] = _alert
+    _IS_CALLABLE[_idx] = not isinstance(_alert, Alert)
+    _ALERT_TYPE_STR[_idx] = sys.intern(f"{EVENT_NAME[_e]}/{_et}")
+    _EVENTS_TYPE_MASK[_e] |= ET_BIT[_et]
+
+# event types of each event, indexed by event name
+_EVENT_TYPES: List[Tuple[str, ...]] = [()] * N_EVENTS
+for _e, _alerts in EVENTS.items():
+  _EVENT_TYPES[_e] = tuple(_alerts)